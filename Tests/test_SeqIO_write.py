@@ -6,9 +6,14 @@
 """Tests for SeqIO write module."""
 
 import os
-import unittest
+import sys
 import warnings
 from io import BytesIO
+try:
+    from itertools import zip_longest
+except ImportError:
+    # Python 2
+    from itertools import izip_longest as zip_longest
 from Bio._py3k import StringIO
 from Bio import BiopythonWarning
 from Bio import SeqIO
@@ -17,6 +22,16 @@ from Bio.SeqRecord import SeqRecord
 from Bio.Seq import Seq
 from Bio import Alphabet
 
+# Remove unittest2 import after dropping support for Python 2
+if sys.version_info[0] < 3:
+    try:
+        import unittest2 as unittest
+    except ImportError:
+        from Bio import MissingPythonDependencyError
+        raise MissingPythonDependencyError("Under Python 2 this test needs the unittest2 library")
+else:
+    import unittest
+
 
 # List of formats including alignment only file formats we can read AND write.
 # We don't care about the order
@@ -27,6 +42,8 @@ for format in sorted(AlignIO._FormatToWriter):
 test_write_read_alignment_formats.remove("gb")  # an alias for genbank
 test_write_read_alignment_formats.remove("fastq-sanger")  # an alias for fastq
 
+BINARY_FORMATS = frozenset(SeqIO._BinaryFormats)
+
 
 # This is a list of three-tuples.  Each tuple contains a
 # list of SeqRecord objects, a description (string), and
@@ -76,15 +93,34 @@ test_records[4][0][2].annotations["weight"] = 2.5
 
 
 class WriterTests(unittest.TestCase):
-    """Cunning unit test where methods are added at run time."""
+    """Check records can be written and read back in each format."""
+
+    def setUp(self):
+        # Reused (after emptying) for each write, see _handle
+        self._bio = BytesIO()
+        self._sio = StringIO()
 
-    def check(self, records, format):
+    def tearDown(self):
+        self._bio.close()
+        self._sio.close()
+
+    def _handle(self, format):
+        """Return an empty in-memory handle suitable for the format."""
+        if format in BINARY_FORMATS:
+            handle = self._bio
+        else:
+            handle = self._sio
+        handle.seek(0)
+        handle.truncate(0)
+        return handle
+
+    def check(self, records, format, nlengths):
         """General test function with with a little format specific information.
 
-        This has some general expected exceptions hard coded!
+        This has some general expected exceptions hard coded! The number of
+        distinct sequence lengths in the records is given as nlengths.
         """
         # TODO - Check the exception messages?
-        lengths = len({len(r) for r in records})
         if not records and format in ["stockholm", "phylip", "phylip-relaxed",
                                       "phylip-sequential", "nexus", "clustal",
                                       "sff", "mauve"]:
@@ -93,7 +129,7 @@ class WriterTests(unittest.TestCase):
         elif not records and format == "nib":
             self.check_write_fails(records, format, ValueError,
                                    "Must have one sequence")
-        elif lengths > 1 and format in AlignIO._FormatToWriter:
+        elif nlengths > 1 and format in AlignIO._FormatToWriter:
             self.check_write_fails(records, format, ValueError,
                                    "Sequences must all be the same length")
         elif len(records) > 1 and format == "nib":
@@ -112,17 +148,15 @@ class WriterTests(unittest.TestCase):
             self.check_simple(records, format)
 
     def check_simple(self, records, format):
-        if format in SeqIO._BinaryFormats:
-            handle = BytesIO()
-        else:
-            handle = StringIO()
+        handle = self._handle(format)
         count = SeqIO.write(records, handle, format)
         self.assertEqual(count, len(records))
         # Now read them back...
         handle.seek(0)
-        new_records = list(SeqIO.parse(handle, format))
-        self.assertEqual(len(new_records), len(records))
-        for record, new_record in zip(records, new_records):
+        new_records = SeqIO.parse(handle, format)
+        for record, new_record in zip_longest(records, new_records):
+            self.assertIsNotNone(record, "Read back more records than written")
+            self.assertIsNotNone(new_record, "Read back fewer records than written")
             # Using compare_record(record, new_record) is too strict
             if format == "nexus":
                 # The nexus parser will dis-ambiguate repeated record ids.
@@ -131,13 +165,9 @@ class WriterTests(unittest.TestCase):
             else:
                 self.assertEqual(record.id, new_record.id)
             self.assertEqual(str(record.seq), str(new_record.seq))
-        handle.close()
 
     def check_write_fails(self, records, format, err_type, err_msg=""):
-        if format in SeqIO._BinaryFormats:
-            handle = BytesIO()
-        else:
-            handle = StringIO()
+        handle = self._handle(format)
         if err_msg:
             try:
                 with warnings.catch_warnings():
@@ -147,7 +177,25 @@ class WriterTests(unittest.TestCase):
                 self.assertEqual(str(err), err_msg)
         else:
             self.assertRaises(err_type, SeqIO.write, records, handle, format)
-        handle.close()
+
+    def test_roundtrip(self):
+        """Write and read back each set of test records in each format."""
+        for records, descr, errs in test_records:
+            # Map each format with an expected failure to its error,
+            # if a format is listed more than once the first one wins:
+            err_map = {}
+            for err_formats, err_type, err_msg in errs:
+                for format in err_formats:
+                    err_map.setdefault(format, (err_type, err_msg))
+            nlengths = len({len(r) for r in records})
+            for format in test_write_read_alignment_formats:
+                with self.subTest(format=format, descr=descr):
+                    if format in err_map:
+                        err_type, err_msg = err_map[format]
+                        self.check_write_fails(records, format,
+                                               err_type, err_msg)
+                    else:
+                        self.check(records, format, nlengths)
 
     def test_bad_handle(self):
         handle = os.devnull
@@ -160,33 +208,6 @@ class WriterTests(unittest.TestCase):
         self.assertEqual(1, SeqIO.write(records, handle, format))
 
 
-for (records, descr, errs) in test_records:
-    for format in test_write_read_alignment_formats:
-        # Assume no errors expected...
-        def funct(records, format, descr):
-            f = lambda x: x.check(records, format)  # noqa: E731
-            f.__doc__ = "%s for %s" % (format, descr)
-            return f
-        setattr(WriterTests,
-                "test_%s_%s" % (format, descr.replace(" ", "_")),
-                funct(records, format, descr))
-        # Replace the method with an error specific one?
-        for err_formats, err_type, err_msg in errs:
-            if format in err_formats:
-                def funct_e(records, format, descr, err_type, err_msg):
-                    f = lambda x: x.check_write_fails(  # noqa: E731
-                        records,
-                        format,
-                        err_type,
-                        err_msg)
-                    f.__doc__ = "%s for %s" % (format, descr)
-                    return f
-                setattr(WriterTests,
-                        "test_%s_%s" % (format, descr.replace(" ", "_")),
-                        funct_e(records, format, descr, err_type, err_msg))
-                break
-        del funct
-
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)